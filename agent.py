@@ -1,11 +1,20 @@
 """Main autonomous flipper agent logic."""
+import asyncio
+import itertools
 import logging
-from typing import Dict, List, Set
+from typing import Dict, Iterable, Iterator, List, Set
 from datetime import datetime
 
-from scrapers import CraigslistScraper, EbayScraper, FacebookScraper
-from heuristics import ValuationEngine
-from storage import SmartBucketsClient
+from scrapers import (CraigslistScraper, EbayScraper, FacebookScraper,
+                      create_request_semaphore, create_session)
+from heuristics import DEFAULT_TOP_K, ValuationEngine
+from storage import SmartBucketsClient, StorageSubmitter
+
+try:
+    from pybloom_live import ScalableBloomFilter
+    _BLOOM_AVAILABLE = True
+except ImportError:
+    _BLOOM_AVAILABLE = False
 
 logging.basicConfig(
     level=logging.INFO,
@@ -29,14 +38,25 @@ class FlipperAgent:
             EbayScraper(category="electronics"),
             FacebookScraper(location="san-francisco", category="electronics")
         ]
+        # Shared by all scrapers; opened on first scan inside the event loop
+        self.http_session = None
 
         self.valuation_engine = ValuationEngine()
         self.storage = SmartBucketsClient(api_key=api_key)
+        self.submitter = StorageSubmitter(self.storage)
 
         # In-memory tracking to avoid duplicates
         self.purchased_ids: Set[str] = set()
         self.listed_ids: Set[str] = set()
 
+        # Compact membership filter of items already in inventory, across runs
+        if _BLOOM_AVAILABLE:
+            self._seen_bloom = ScalableBloomFilter(
+                initial_capacity=1_000_000, error_rate=0.001
+            )
+        else:
+            self._seen_bloom = set()
+
         # Statistics
         self.stats = {
             'listings_scanned': 0,
@@ -57,63 +77,80 @@ class FlipperAgent:
         self.storage.create_bucket('flipper-transactions')
         self.storage.create_bucket('flipper-inventory')
 
-    def scan_marketplaces(self, max_per_marketplace: int = 20) -> List[Dict]:
-        """Scan all marketplaces for new listings.
+        for item_id in self.storage.list_items('flipper-inventory'):
+            self._seen_bloom.add(item_id)
+
+    async def scan_marketplaces(self, max_per_marketplace: int = 20) -> Iterator[Dict]:
+        """Scan all marketplaces concurrently for new listings.
 
         Args:
             max_per_marketplace: Maximum listings to fetch per marketplace
 
         Returns:
-            List of all scraped listings
+            Iterator over all scraped listings
         """
         logger.info("=" * 80)
         logger.info("SCANNING MARKETPLACES FOR NEW LISTINGS")
         logger.info("=" * 80)
 
-        all_listings = []
+        scraped = []
+        total = 0
+
+        logger.info(f"\n📡 Scanning {len(self.scrapers)} marketplaces...")
+
+        # Session and request limiter are bound to the running loop, so
+        # both are created here and released again in close()
+        if self.http_session is None or self.http_session.closed:
+            self.http_session = create_session()
+            semaphore = create_request_semaphore()
+            for scraper in self.scrapers:
+                scraper.set_session(self.http_session, semaphore)
+
+        tasks = [
+            scraper.scrape_listings(max_results=max_per_marketplace)
+            for scraper in self.scrapers
+        ]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
 
-        for scraper in self.scrapers:
+        for scraper, listings in zip(self.scrapers, results):
             marketplace_name = scraper.__class__.__name__.replace('Scraper', '')
-            logger.info(f"\n📡 Scanning {marketplace_name}...")
 
-            try:
-                listings = scraper.scrape_listings(max_results=max_per_marketplace)
-                all_listings.extend(listings)
+            if isinstance(listings, Exception):
+                logger.error(f"✗ Error scraping {marketplace_name}: {listings}")
+                continue
 
-                # Store in SmartBuckets
-                for listing in listings:
-                    self.storage.store_item(
-                        'flipper-listings',
-                        listing['id'],
-                        listing
-                    )
+            scraped.append(listings)
+            total += len(listings)
 
-                logger.info(f"✓ Found {len(listings)} listings from {marketplace_name}")
+            # Queue for SmartBuckets; writes drain in the background
+            for listing in listings:
+                await self.submitter.put('flipper-listings', listing['id'], listing)
 
-            except Exception as e:
-                logger.error(f"✗ Error scraping {marketplace_name}: {e}")
+            logger.info(f"✓ Found {len(listings)} listings from {marketplace_name}")
 
-        self.stats['listings_scanned'] = len(all_listings)
-        logger.info(f"\n📊 Total listings found: {len(all_listings)}")
+        self.stats['listings_scanned'] = total
+        logger.info(f"\n📊 Total listings found: {total}")
 
-        return all_listings
+        return itertools.chain.from_iterable(scraped)
 
-    def evaluate_listings(self, listings: List[Dict]) -> List[Dict]:
+    def evaluate_listings(self, listings: Iterable[Dict],
+                          top_k: int = DEFAULT_TOP_K) -> List[Dict]:
         """Evaluate all listings for value.
 
         Args:
-            listings: List of marketplace listings
+            listings: Iterable of marketplace listings, consumed lazily
+            top_k: Number of best-scoring listings to keep
 
         Returns:
-            Sorted list of evaluated listings (best deals first)
+            Best-scoring evaluated listings, sorted best deals first
         """
         logger.info("\n" + "=" * 80)
         logger.info("EVALUATING LISTINGS WITH HEURISTICS")
         logger.info("=" * 80)
 
-        evaluated = self.valuation_engine.batch_evaluate(listings)
+        evaluated = self.valuation_engine.batch_evaluate(listings, top_k=top_k)
 
-        logger.info(f"\n📊 Evaluated {len(evaluated)} listings")
+        logger.info(f"\n📊 Kept {len(evaluated)} best-scoring listings")
 
         # Show top 5 opportunities
         logger.info("\n🎯 TOP 5 OPPORTUNITIES:")
@@ -146,8 +183,24 @@ class FlipperAgent:
 
         to_purchase = []
         remaining_budget = budget
+        min_score = self.valuation_engine.min_score
+
+        # Decisions in one pass share a timestamp
+        now_iso = datetime.now().isoformat()
 
         for item in evaluated_listings:
+            # Listings are sorted by score, so nothing after this can qualify
+            if item['score'] < min_score:
+                break
+
+            # Nothing is free, so an exhausted budget ends the search
+            if remaining_budget <= 0:
+                break
+
+            # Skip if already in inventory from a previous run
+            if item['id'] in self._seen_bloom:
+                continue
+
             # Skip if already purchased
             if item['id'] in self.purchased_ids:
                 continue
@@ -171,11 +224,12 @@ class FlipperAgent:
                 'score': item['score'],
                 'profit_potential': item['profit_potential'],
                 'reasoning': item['reasoning'],
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso
             }
 
             to_purchase.append(item)
             self.purchased_ids.add(item['id'])
+            self._seen_bloom.add(item['id'])
             remaining_budget -= price
 
             self.stats['decisions'].append(decision)
@@ -200,41 +254,45 @@ class FlipperAgent:
         logger.info("EXECUTING PURCHASES")
         logger.info("=" * 80)
 
+        inventory_items = []
+        transactions = []
+
+        now = datetime.now()
+        now_iso = now.isoformat()
+        now_ts = int(now.timestamp())
+
         for item in items:
             logger.info(f"\n🛒 Purchasing: {item['title'][:50]}")
 
-            # Store in inventory bucket
+            # Add to inventory bucket
             inventory_item = {
                 **item,
-                'purchase_date': datetime.now().isoformat(),
+                'purchase_date': now_iso,
                 'status': 'purchased'
             }
-
-            self.storage.store_item(
-                'flipper-inventory',
-                item['id'],
-                inventory_item
-            )
+            inventory_items.append((item['id'], inventory_item))
 
             # Record transaction
             transaction = {
                 'type': 'purchase',
                 'item_id': item['id'],
                 'amount': item['price'],
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso
             }
-
-            self.storage.store_item(
-                'flipper-transactions',
-                f"buy_{item['id']}_{int(datetime.now().timestamp())}",
+            transactions.append((
+                f"buy_{item['id']}_{now_ts}",
                 transaction
-            )
+            ))
 
             self.stats['items_purchased'] += 1
             self.stats['total_invested'] += item['price']
 
             logger.info(f"   ✓ Purchase complete - Added to inventory")
 
+        if inventory_items:
+            self.storage.store_items_batch('flipper-inventory', inventory_items)
+            self.storage.store_items_batch('flipper-transactions', transactions)
+
     def relist_items(self, items: List[Dict]):
         """Re-list purchased items at higher price.
 
@@ -245,6 +303,9 @@ class FlipperAgent:
         logger.info("RE-LISTING ITEMS FOR SALE")
         logger.info("=" * 80)
 
+        resale_listings = []
+        now_iso = datetime.now().isoformat()
+
         for item in items:
             if item['id'] in self.listed_ids:
                 continue
@@ -260,15 +321,11 @@ class FlipperAgent:
             listing = {
                 **item,
                 'resale_price': resale_price,
-                'listed_date': datetime.now().isoformat(),
+                'listed_date': now_iso,
                 'status': 'listed'
             }
 
-            self.storage.store_item(
-                'flipper-listings',
-                f"resale_{item['id']}",
-                listing
-            )
+            resale_listings.append((f"resale_{item['id']}", listing))
 
             self.listed_ids.add(item['id'])
             self.stats['items_listed'] += 1
@@ -276,21 +333,31 @@ class FlipperAgent:
 
             logger.info(f"   ✓ Listed successfully")
 
-    def run_cycle(self, budget: float = 5000.0, max_per_marketplace: int = 20):
+        if resale_listings:
+            self.storage.store_items_batch('flipper-listings', resale_listings)
+
+    async def run_cycle(self, budget: float = 5000.0, max_per_marketplace: int = 20):
         """Run a complete flip cycle: scan, evaluate, buy, relist.
 
         Args:
             budget: Available budget for purchases
             max_per_marketplace: Max listings to scan per marketplace
         """
+        try:
+            await self._run_cycle(budget, max_per_marketplace)
+        finally:
+            await self.close()
+
+    async def _run_cycle(self, budget: float, max_per_marketplace: int):
+        """Execute the steps of a single flip cycle."""
         logger.info("\n" + "🤖" * 40)
         logger.info("AUTONOMOUS FLIPPER AGENT - STARTING NEW CYCLE")
         logger.info("🤖" * 40)
 
         # Step 1: Scan marketplaces
-        listings = self.scan_marketplaces(max_per_marketplace)
+        listings = await self.scan_marketplaces(max_per_marketplace)
 
-        if not listings:
+        if not self.stats['listings_scanned']:
             logger.warning("No listings found. Ending cycle.")
             return
 
@@ -313,6 +380,16 @@ class FlipperAgent:
         # Step 6: Show final stats
         self.show_statistics()
 
+    async def close(self):
+        """Flush pending storage writes and release HTTP sessions."""
+        await self.submitter.drain()
+        self.storage.close()
+        await asyncio.gather(*(scraper.close() for scraper in self.scrapers))
+
+        if self.http_session is not None:
+            await self.http_session.close()
+            self.http_session = None
+
     def show_statistics(self):
         """Display agent statistics and performance."""
         logger.info("\n" + "=" * 80)
@@ -1,4 +1,4 @@
 """Heuristics package for item valuation."""
-from .valuation import ValuationEngine
+from .valuation import DEFAULT_TOP_K, ValuationEngine
 
-__all__ = ['ValuationEngine']
+__all__ = ['DEFAULT_TOP_K', 'ValuationEngine']
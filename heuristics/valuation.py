@@ -1,10 +1,141 @@
 """Valuation heuristics for identifying undervalued items."""
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+import heapq
+import itertools
 import logging
 import statistics
+from operator import itemgetter
+
+import numpy as np
+
+try:
+    import ahocorasick
+    _AHOCORASICK_AVAILABLE = True
+except ImportError:
+    _AHOCORASICK_AVAILABLE = False
+
+try:
+    from numba import njit, prange
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Default number of best-scoring results kept by batch_evaluate
+DEFAULT_TOP_K = 200
+
+# Number of listings scored per kernel call
+BATCH_CHUNK_SIZE = 1024
+
+# Sort key for evaluated listings
+_SCORE_KEY = itemgetter('score')
+
+# Reasoning for each (historical > 60, msrp > 60, scarcity > 70) bitmask
+_REASONS = (
+    (0b100, "Price is significantly below historical average"),
+    (0b010, "Deep discount from MSRP"),
+    (0b001, "High demand or scarcity indicators")
+)
+_REASONING_TABLE = tuple(
+    "; ".join(reason for bit, reason in _REASONS if mask & bit)
+    for mask in range(8)
+)
+
+# Columns of the score matrix filled in by the scoring kernel
+_HISTORICAL, _MSRP, _SCARCITY, _RATIO, _TOTAL = range(5)
+
+
+def _score_arrays(price, avg, msrp, scarcity_count, demand_count, out):
+    """Score listings column-wise with NumPy.
+
+    Fills out[:, _HISTORICAL.._TOTAL] with the four heuristic scores and
+    their weighted total. Used when numba is not installed.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out[:, _HISTORICAL] = np.where(
+            price >= avg, 0.0, np.minimum(100, (avg - price) / avg * 200)
+        )
+        out[:, _MSRP] = np.where(
+            (msrp <= 0) | (price >= msrp),
+            0.0, np.minimum(100, (msrp - price) / msrp * 150)
+        )
+        ratio = price / avg
+        out[:, _RATIO] = np.where(
+            ratio >= 1.0, 0.0, np.where(ratio <= 0.5, 100.0, (1.0 - ratio) * 200)
+        )
+
+    out[:, _SCARCITY] = np.minimum(100, 50 + scarcity_count * 20 + demand_count * 10)
+    out[:, _TOTAL] = (
+        out[:, _HISTORICAL] * 0.40 +
+        out[:, _MSRP] * 0.25 +
+        out[:, _SCARCITY] * 0.20 +
+        out[:, _RATIO] * 0.15
+    )
+
+
+def _round_cents(values):
+    """Round a column to 2 decimals, matching round(x, 2) element for element.
+
+    Values are scaled to cents and rounded to the nearest integer in NumPy.
+    The scaling is inexact, so the few values that land within its error
+    of a half cent, or beyond exact float integers, go through round().
+    """
+    cents = values * 100
+    with np.errstate(invalid='ignore'):
+        exact = np.abs(cents) < 2.0 ** 52
+        exact &= np.abs(cents - np.floor(cents) - 0.5) > np.abs(cents) * 2.0 ** -51
+    rounded = np.rint(cents) / 100
+    rounded[~exact] = [round(value, 2) for value in values[~exact].tolist()]
+    return rounded
+
+
+if _NUMBA_AVAILABLE:
+    @njit(cache=True, parallel=True, error_model='numpy')
+    def _score_kernel(price, avg, msrp, scarcity_count, demand_count, out):
+        """Fused single-pass version of _score_arrays."""
+        for i in prange(price.shape[0]):
+            p = price[i]
+            a = avg[i]
+            m = msrp[i]
+
+            historical = 0.0
+            if p < a:
+                historical = min(100.0, (a - p) / a * 200)
+
+            msrp_score = 0.0
+            if m > 0 and p < m:
+                msrp_score = min(100.0, (m - p) / m * 150)
+
+            scarcity = min(100.0, 50.0 + scarcity_count[i] * 20 + demand_count[i] * 10)
+
+            ratio = p / a
+            ratio_score = 0.0
+            if ratio <= 0.5:
+                ratio_score = 100.0
+            elif ratio < 1.0:
+                ratio_score = (1.0 - ratio) * 200
+
+            out[i, _HISTORICAL] = historical
+            out[i, _MSRP] = msrp_score
+            out[i, _SCARCITY] = scarcity
+            out[i, _RATIO] = ratio_score
+            out[i, _TOTAL] = (
+                historical * 0.40 +
+                msrp_score * 0.25 +
+                scarcity * 0.20 +
+                ratio_score * 0.15
+            )
+
+    # Compile at import so the first batch doesn't pay for it
+    _score_kernel(
+        np.ones(1), np.ones(1), np.ones(1),
+        np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int64),
+        np.zeros((1, 5))
+    )
+else:
+    _score_kernel = _score_arrays
+
 
 class ValuationEngine:
     """Engine for evaluating if an item is undervalued."""
@@ -26,8 +157,44 @@ class ValuationEngine:
             "headphones": {"avg": 225, "min": 150, "max": 350, "msrp": 299}
         }
 
-        # Profit margin threshold
+        # Title keywords that signal scarcity or demand
+        self.scarcity_keywords = ['limited', 'rare', 'discontinued', 'collectors']
+        self.demand_keywords = ['pro', 'max', 'ultra', 'premium']
+
+        # Undervalued thresholds
+        self.min_score = 60
         self.min_profit_margin = 0.20  # 20% minimum profit margin
+        self.min_profit = 50  # Minimum $50 profit
+
+        # Every keyword tagged with an integer code, matched in one pass per
+        # title. Products come first, so a product's code is its category id
+        self._keywords = (
+            list(self.historical_prices) + self.scarcity_keywords + self.demand_keywords
+        )
+        n_products = len(self.historical_prices)
+        n_scarcity = len(self.scarcity_keywords)
+        self._scarcity_tags = frozenset(range(n_products, n_products + n_scarcity))
+        self._demand_tags = frozenset(range(n_products + n_scarcity, len(self._keywords)))
+        # Without pyahocorasick, keywords are matched against whole title words
+        self._token_tags = {key: code for code, key in enumerate(self._keywords)}
+        self._automaton = None
+        if _AHOCORASICK_AVAILABLE:
+            self._automaton = ahocorasick.Automaton()
+            for code, key in enumerate(self._keywords):
+                self._automaton.add_word(key, code)
+            self._automaton.make_automaton()
+
+        # Historical prices as parallel arrays indexed by category id
+        self._product_keys = list(self.historical_prices)
+        history = self.historical_prices.values()
+        self._avg = np.array([data['avg'] for data in history], dtype=np.float32)
+        self._min = np.array([data['min'] for data in history], dtype=np.float32)
+        self._max = np.array([data['max'] for data in history], dtype=np.float32)
+        self._msrp = np.array([data['msrp'] for data in history], dtype=np.float32)
+
+        # float64 views gathered by the scoring kernel, widened once here
+        self._avg64 = self._avg.astype(np.float64)
+        self._msrp64 = self._msrp.astype(np.float64)
 
     def evaluate_listing(self, listing: Dict) -> Dict:
         """Evaluate a listing and return valuation score.
@@ -40,38 +207,34 @@ class ValuationEngine:
             - profit_potential: float
             - reasoning: str
         """
-        title = listing.get('title', '').lower()
         current_price = listing.get('price', 0)
 
         if current_price <= 0:
             return self._no_value_result("Invalid price")
 
+        # Match all product, scarcity and demand keywords at once
+        hits = self._match_keywords(self._lowercase_title(listing))
+
         # Find matching product category
-        historical_data = self._find_historical_data(title)
+        idx = self._find_historical_data(hits)
 
-        if not historical_data:
+        if idx < 0:
             return self._no_value_result("No historical data available")
 
         # Calculate heuristic scores
         scores = {}
 
         # 1. Historical Price Comparison (40% weight)
-        scores['historical'] = self._historical_price_score(
-            current_price, historical_data
-        )
+        scores['historical'] = self._historical_price_score(current_price, idx)
 
         # 2. MSRP Anchoring (25% weight)
-        scores['msrp'] = self._msrp_anchor_score(
-            current_price, historical_data.get('msrp', 0)
-        )
+        scores['msrp'] = self._msrp_anchor_score(current_price, idx)
 
         # 3. Scarcity/Demand Heuristic (20% weight)
-        scores['scarcity'] = self._scarcity_score(title, historical_data)
+        scores['scarcity'] = self._scarcity_score(hits)
 
         # 4. Price-to-Average Ratio (15% weight)
-        scores['ratio'] = self._price_ratio_score(
-            current_price, historical_data.get('avg', 0)
-        )
+        scores['ratio'] = self._price_ratio_score(current_price, idx)
 
         # Weighted total score
         total_score = (
@@ -82,17 +245,22 @@ class ValuationEngine:
         )
 
         # Estimate resale price (conservative: use avg historical price)
-        estimated_resale = historical_data.get('avg', current_price * 1.3)
+        estimated_resale = float(self._avg[idx])
+
+        return self._build_result(scores, total_score, current_price, estimated_resale)
 
+    def _build_result(self, scores: Dict, total_score: float,
+                      current_price: float, estimated_resale: float) -> Dict:
+        """Assemble the valuation result from the heuristic scores."""
         # Calculate profit potential
         profit = estimated_resale - current_price
         profit_margin = (profit / current_price) if current_price > 0 else 0
 
         # Determine if undervalued
         is_undervalued = (
-            total_score >= 60 and
+            total_score >= self.min_score and
             profit_margin >= self.min_profit_margin and
-            profit > 50  # Minimum $50 profit
+            profit > self.min_profit
         )
 
         reasoning = self._generate_reasoning(
@@ -109,16 +277,30 @@ class ValuationEngine:
             'scores_breakdown': scores
         }
 
-    def _find_historical_data(self, title: str) -> Dict:
-        """Find matching historical price data."""
-        for product_key, data in self.historical_prices.items():
-            if product_key in title:
-                return data
-        return None
+    def _lowercase_title(self, listing: Dict) -> str:
+        """Return the listing's lowercased title, computed by the scraper if present."""
+        title_lc = listing.get('title_lc')
+        if title_lc is None:
+            title_lc = listing.get('title', '').lower()
+        return title_lc
 
-    def _historical_price_score(self, current: float, historical: Dict) -> float:
+    def _match_keywords(self, title: str) -> Set[int]:
+        """Return the keyword codes found in a lowercased title."""
+        if self._automaton is not None:
+            return {tag for _, tag in self._automaton.iter(title)}
+
+        token_tags = self._token_tags
+        return {token_tags[token] for token in title.split() if token in token_tags}
+
+    def _find_historical_data(self, hits: Set[int]) -> int:
+        """Find the category id of the matching historical data, or -1."""
+        # The first category in historical_prices order wins, i.e. the lowest code
+        idx = min(hits, default=-1)
+        return idx if idx < len(self._product_keys) else -1
+
+    def _historical_price_score(self, current: float, idx: int) -> float:
         """Score based on how far below historical average."""
-        avg = historical.get('avg', current)
+        avg = float(self._avg[idx])
         if current >= avg:
             return 0
 
@@ -126,33 +308,30 @@ class ValuationEngine:
         discount_pct = (avg - current) / avg
         return min(100, discount_pct * 200)  # 50% below avg = 100 points
 
-    def _msrp_anchor_score(self, current: float, msrp: float) -> float:
+    def _msrp_anchor_score(self, current: float, idx: int) -> float:
         """Score based on discount from MSRP."""
+        msrp = float(self._msrp[idx])
         if msrp <= 0 or current >= msrp:
             return 0
 
         discount_pct = (msrp - current) / msrp
         return min(100, discount_pct * 150)  # 67% below MSRP = 100 points
 
-    def _scarcity_score(self, title: str, historical: Dict) -> float:
-        """Score based on scarcity indicators."""
-        scarcity_keywords = ['limited', 'rare', 'discontinued', 'collectors']
-        demand_keywords = ['pro', 'max', 'ultra', 'premium']
-
-        score = 50  # baseline
-
-        for keyword in scarcity_keywords:
-            if keyword in title:
-                score += 20
-
-        for keyword in demand_keywords:
-            if keyword in title:
-                score += 10
+    def _keyword_counts(self, hit_categories: Set[int]) -> Tuple[int, int]:
+        """Count the distinct scarcity and demand keywords among the hits."""
+        scarcity = len(hit_categories & self._scarcity_tags)
+        demand = len(hit_categories & self._demand_tags)
+        return scarcity, demand
 
+    def _scarcity_score(self, hit_categories: Set[int]) -> float:
+        """Score based on scarcity indicators."""
+        scarcity, demand = self._keyword_counts(hit_categories)
+        score = 50 + scarcity * 20 + demand * 10  # 50 is the baseline
         return min(100, score)
 
-    def _price_ratio_score(self, current: float, avg: float) -> float:
+    def _price_ratio_score(self, current: float, idx: int) -> float:
         """Score based on price-to-average ratio."""
+        avg = float(self._avg[idx])
         if avg <= 0:
             return 0
 
@@ -169,24 +348,22 @@ class ValuationEngine:
     def _generate_reasoning(self, scores: Dict, current: float,
                            resale: float, margin: float) -> str:
         """Generate human-readable reasoning."""
-        reasons = []
-
-        if scores['historical'] > 60:
-            reasons.append(f"Price is significantly below historical average")
-
-        if scores['msrp'] > 60:
-            reasons.append(f"Deep discount from MSRP")
+        mask = (
+            (scores['historical'] > 60) << 2 |
+            (scores['msrp'] > 60) << 1 |
+            (scores['scarcity'] > 70)
+        )
+        return self._reasoning_text(mask, margin)
 
-        if scores['scarcity'] > 70:
-            reasons.append(f"High demand or scarcity indicators")
+    def _reasoning_text(self, mask: int, margin: float) -> str:
+        """Return the reasoning for a _REASONING_TABLE bitmask and profit margin."""
+        reasoning = _REASONING_TABLE[mask]
 
         if margin >= 0.30:
-            reasons.append(f"Excellent profit margin ({margin*100:.0f}%)")
+            margin_reason = f"Excellent profit margin ({margin*100:.0f}%)"
+            return f"{reasoning}; {margin_reason}" if reasoning else margin_reason
 
-        if not reasons:
-            reasons.append("Price is close to market average")
-
-        return "; ".join(reasons)
+        return reasoning or "Price is close to market average"
 
     def _no_value_result(self, reason: str) -> Dict:
         """Return a no-value result."""
@@ -200,16 +377,103 @@ class ValuationEngine:
             'scores_breakdown': {}
         }
 
-    def batch_evaluate(self, listings: List[Dict]) -> List[Dict]:
-        """Evaluate multiple listings and return sorted by score."""
-        results = []
+    def batch_evaluate(self, listings: Iterable[Dict],
+                       top_k: int = DEFAULT_TOP_K) -> List[Dict]:
+        """Evaluate listings and return the top_k sorted by score.
+
+        Listings are consumed lazily in chunks, so only the current chunk
+        and the best top_k results are held in memory at once. Selecting
+        the top_k costs O(N log top_k) rather than a full sort.
+        """
+        best = []
+        for chunk in self._iter_chunks(listings):
+            # nlargest sorts outright when everything fits in top_k, and
+            # keeps earlier listings first among equal scores
+            best = heapq.nlargest(top_k, best + self._evaluate_chunk(chunk), key=_SCORE_KEY)
+        return best
+
+    def _iter_chunks(self, listings: Iterable[Dict]) -> Iterator[List[Dict]]:
+        """Yield the listings BATCH_CHUNK_SIZE at a time."""
+        listings = iter(listings)
+        while True:
+            chunk = list(itertools.islice(listings, BATCH_CHUNK_SIZE))
+            if not chunk:
+                return
+            yield chunk
+
+    def _evaluate_chunk(self, listings: List[Dict]) -> List[Dict]:
+        """Evaluate a chunk of listings in input order.
+
+        The heuristics are computed over NumPy columns by _score_kernel;
+        only the result dicts are assembled per listing.
+        """
+        hits = [self._match_keywords(self._lowercase_title(listing)) for listing in listings]
+
+        # Built as Python lists and converted once; per-element NumPy stores cost more
+        scarcity_tags = self._scarcity_tags
+        demand_tags = self._demand_tags
+        price_col = [listing.get('price', 0) for listing in listings]
+        idx_col = [self._find_historical_data(tags) for tags in hits]
+        scarcity_col = [len(tags & scarcity_tags) for tags in hits]
+        demand_col = [len(tags & demand_tags) for tags in hits]
+
+        prices = np.array(price_col, dtype=np.float64)
+        idx = np.array(idx_col, dtype=np.intp)
+
+        # Rows with a bad price or no category are scored but discarded below
+        avg = self._avg64[idx]
+        scores = np.empty((len(listings), 5), dtype=np.float64)
+        _score_kernel(
+            prices, avg, self._msrp64[idx],
+            np.array(scarcity_col, dtype=np.int64), np.array(demand_col, dtype=np.int64),
+            scores
+        )
 
-        for listing in listings:
-            evaluation = self.evaluate_listing(listing)
-            result = {**listing, **evaluation}
-            results.append(result)
+        # The result fields are derived column-wise too, matching _build_result
+        with np.errstate(divide='ignore', invalid='ignore'):
+            profit = avg - prices
+            margin = profit / prices
+        total = scores[:, _TOTAL]
+        undervalued = (
+            (total >= self.min_score) &
+            (margin >= self.min_profit_margin) &
+            (profit > self.min_profit)
+        )
+        masks = (
+            (scores[:, _HISTORICAL] > 60).astype(np.intp) << 2 |
+            (scores[:, _MSRP] > 60).astype(np.intp) << 1 |
+            (scores[:, _SCARCITY] > 70).astype(np.intp)
+        )
+
+        rounded = _round_cents(np.stack((total, avg, profit, margin * 100))).tolist()
+
+        results = []
 
-        # Sort by score descending
-        results.sort(key=lambda x: x['score'], reverse=True)
+        # Unbox every result value at once rather than per element
+        for (listing, price, category, undervalued_, score, resale, profit_, profit_pct,
+             mask, margin_, row) in zip(
+                listings, price_col, idx_col, undervalued.tolist(), *rounded,
+                masks.tolist(), margin.tolist(), scores.tolist()):
+            if price <= 0:
+                evaluation = self._no_value_result("Invalid price")
+            elif category < 0:
+                evaluation = self._no_value_result("No historical data available")
+            else:
+                evaluation = {
+                    'is_undervalued': undervalued_,
+                    'score': score,
+                    'estimated_resale': resale,
+                    'profit_potential': profit_,
+                    'profit_margin': profit_pct,
+                    'reasoning': self._reasoning_text(mask, margin_),
+                    'scores_breakdown': {
+                        'historical': row[_HISTORICAL],
+                        'msrp': row[_MSRP],
+                        'scarcity': row[_SCARCITY],
+                        'ratio': row[_RATIO]
+                    }
+                }
+
+            results.append({**listing, **evaluation})
 
         return results
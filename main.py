@@ -1,4 +1,5 @@
 """Main entry point for the autonomous flipper agent."""
+import asyncio
 import os
 import sys
 from dotenv import load_dotenv
@@ -27,7 +28,7 @@ def main():
     # Parameters:
     # - budget: How much money to spend on purchases
     # - max_per_marketplace: How many listings to scan per marketplace
-    agent.run_cycle(budget=5000.0, max_per_marketplace=30)
+    asyncio.run(agent.run_cycle(budget=5000.0, max_per_marketplace=30))
 
     print("\n✨ Agent cycle complete!")
 
@@ -1,6 +1,8 @@
 """Marketplace scrapers package."""
+from .base_scraper import create_request_semaphore, create_session
 from .craigslist_scraper import CraigslistScraper
 from .ebay_scraper import EbayScraper
 from .facebook_scraper import FacebookScraper
 
-__all__ = ['CraigslistScraper', 'EbayScraper', 'FacebookScraper']
+__all__ = ['CraigslistScraper', 'EbayScraper', 'FacebookScraper', 'create_request_semaphore',
+           'create_session']
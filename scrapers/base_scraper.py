@@ -1,33 +1,70 @@
 """Base scraper class for marketplace scrapers."""
 from abc import ABC, abstractmethod
-from typing import List, Dict
-import requests
-from bs4 import BeautifulSoup
-import time
+from typing import List, Dict, Optional
+import asyncio
+import hashlib
+import re
+import sys
+import aiohttp
+from selectolax.lexbor import LexborHTMLParser
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Maximum number of marketplace requests in flight at once
+MAX_CONCURRENT_REQUESTS = 5
+
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+# Everything except digits and the decimal point
+_NON_PRICE_CHARS = re.compile(r'[^\d.]')
+
+
+def create_session() -> aiohttp.ClientSession:
+    """Create an HTTP session backed by a keep-alive connection pool.
+
+    One session can be shared by all scrapers so TCP and TLS setup to a
+    host is paid once and reused across requests. Must be called from
+    inside a running event loop.
+    """
+    connector = aiohttp.TCPConnector(limit=100, limit_per_host=10, keepalive_timeout=30)
+    return aiohttp.ClientSession(connector=connector)
+
+
+def create_request_semaphore() -> asyncio.BoundedSemaphore:
+    """Create the limiter that caps marketplace requests in flight.
+
+    One semaphore can be shared by all scrapers so concurrent scans stay
+    polite. asyncio primitives bind to the loop they are first used in,
+    so create one per event loop, alongside the shared session.
+    """
+    return asyncio.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+
 
 class BaseScraper(ABC):
     """Abstract base class for marketplace scrapers."""
 
-    def __init__(self, category: str = "electronics"):
-        self.category = category
-        self.session = requests.Session()
-        self.session.headers.update({
+    def __init__(self, category: str = "electronics",
+                 session: Optional[aiohttp.ClientSession] = None):
+        # Interned so every listing shares one string object for grouping and filtering
+        self.category = sys.intern(category)
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        })
+        }
+        # Without a shared session one is created lazily, since aiohttp
+        # sessions must be opened inside a running loop
+        self.set_session(session)
 
     @abstractmethod
-    def scrape_listings(self, max_results: int = 50) -> List[Dict]:
+    async def scrape_listings(self, max_results: int = 50) -> List[Dict]:
         """Scrape listings from the marketplace.
 
         Returns:
             List of listing dictionaries with keys:
             - id: unique identifier
             - title: item title
+            - title_lc: lowercased title, used for keyword matching
             - price: current price
             - url: listing URL
             - marketplace: source marketplace
@@ -36,23 +73,82 @@ class BaseScraper(ABC):
         """
         pass
 
-    def _make_request(self, url: str, delay: float = 1.0) -> BeautifulSoup:
+    def set_session(self, session: Optional[aiohttp.ClientSession],
+                    semaphore: Optional[asyncio.BoundedSemaphore] = None):
+        """Use a shared HTTP session; the caller remains responsible for closing it.
+
+        Args:
+            session: Shared session, or None to create one lazily
+            semaphore: Shared request limiter, or None to create one lazily
+        """
+        self.session = session
+        self._owns_session = session is None
+        self._request_semaphore = semaphore
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the open HTTP session, creating it on first use."""
+        if self.session is None or self.session.closed:
+            self.session = create_session()
+            self._owns_session = True
+        return self.session
+
+    def _get_semaphore(self) -> asyncio.BoundedSemaphore:
+        """Return the request limiter, creating it on first use."""
+        if self._request_semaphore is None:
+            self._request_semaphore = create_request_semaphore()
+        return self._request_semaphore
+
+    async def close(self):
+        """Close the HTTP session if this scraper created it."""
+        if self._owns_session and self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.set_session(None)
+
+    async def _fetch(self, url: str, delay: float = 1.0) -> Optional[bytes]:
+        """Make a rate-limited request and return the raw response body."""
+        async with self._get_semaphore():
+            await asyncio.sleep(delay)
+            try:
+                session = self._get_session()
+                async with session.get(url, headers=self.headers,
+                                       timeout=REQUEST_TIMEOUT) as response:
+                    response.raise_for_status()
+                    # selectolax parses whole documents, so there is nothing
+                    # to overlap with a chunked read; take the body in one go
+                    return await response.read()
+            except Exception as e:
+                logger.error(f"Request failed for {url}: {e}")
+                return None
+
+    async def _make_request(self, url: str, delay: float = 1.0) -> LexborHTMLParser:
         """Make a rate-limited request and return parsed HTML."""
-        time.sleep(delay)
-        try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            return BeautifulSoup(response.content, 'lxml')
-        except Exception as e:
-            logger.error(f"Request failed for {url}: {e}")
+        content = await self._fetch(url, delay)
+        if content is None:
             return None
+        return LexborHTMLParser(content)
+
+    def _stable_hash(self, text: str) -> str:
+        """Return a 64-bit hex digest of text that is stable across runs."""
+        return hashlib.blake2b(text.encode(), digest_size=8).hexdigest()
+
+    def _listing_hash(self, listing_url: str, title: str, index: int) -> str:
+        """Return the ID digest for a scraped listing.
+
+        Listings are keyed by URL, which is stable across runs. Without a
+        URL the page index is mixed in with the title, so same-titled
+        listings on one page stay distinct; such IDs are not stable
+        across runs.
+        """
+        if listing_url:
+            return self._stable_hash(listing_url)
+        return self._stable_hash(f"{index}:{title}")
 
     def _extract_price(self, price_str: str) -> float:
         """Extract numeric price from string."""
         if not price_str:
             return 0.0
         # Remove currency symbols and commas
-        cleaned = ''.join(c for c in price_str if c.isdigit() or c == '.')
+        cleaned = _NON_PRICE_CHARS.sub('', price_str)
         try:
             return float(cleaned)
         except ValueError:
@@ -1,7 +1,8 @@
 """Craigslist marketplace scraper."""
-from typing import List, Dict
+from typing import List, Dict, Optional
 from datetime import datetime
 import logging
+import aiohttp
 from .base_scraper import BaseScraper
 
 logger = logging.getLogger(__name__)
@@ -10,12 +11,13 @@ logger = logging.getLogger(__name__)
 class CraigslistScraper(BaseScraper):
     """Scraper for Craigslist listings."""
 
-    def __init__(self, city: str = "sfbay", category: str = "electronics"):
-        super().__init__(category)
+    def __init__(self, city: str = "sfbay", category: str = "electronics",
+                 session: Optional[aiohttp.ClientSession] = None):
+        super().__init__(category, session)
         self.city = city
         self.base_url = f"https://{city}.craigslist.org"
 
-    def scrape_listings(self, max_results: int = 50) -> List[Dict]:
+    async def scrape_listings(self, max_results: int = 50) -> List[Dict]:
         """Scrape Craigslist listings."""
         listings = []
 
@@ -29,47 +31,50 @@ class CraigslistScraper(BaseScraper):
         category_path = category_map.get(self.category, "/d/electronics/search/ela")
         url = f"{self.base_url}{category_path}"
 
-        logger.info(f"Scraping Craigslist: {url}")
+        logger.info("Scraping Craigslist: %s", url)
 
-        soup = self._make_request(url)
-        if not soup:
+        tree = await self._make_request(url)
+        if not tree:
             logger.warning("Failed to fetch Craigslist listings")
             return []
 
+        # One timestamp for the whole batch
+        now_iso = datetime.now().isoformat()
+
         # Find all listing items
-        items = soup.find_all('li', class_='cl-static-search-result', limit=max_results)
+        items = tree.css('li.cl-static-search-result')[:max_results]
 
         for idx, item in enumerate(items):
             try:
                 # Extract title
-                title_elem = item.find('div', class_='title')
-                title = title_elem.get_text(strip=True) if title_elem else "Unknown"
+                title_elem = item.css_first('div.title')
+                title = title_elem.text(strip=True) if title_elem else "Unknown"
 
                 # Extract price
-                price_elem = item.find('div', class_='price')
-                price_str = price_elem.get_text(strip=True) if price_elem else "$0"
+                price_elem = item.css_first('div.price')
+                price_str = price_elem.text(strip=True) if price_elem else "$0"
                 price = self._extract_price(price_str)
 
                 # Extract URL
-                link_elem = item.find('a')
-                listing_url = link_elem['href'] if link_elem and 'href' in link_elem.attrs else ""
+                link_elem = item.css_first('a')
+                listing_url = (link_elem.attributes.get('href') or "") if link_elem else ""
 
-                # Generate ID from URL or index
-                listing_id = f"cl_{self.city}_{idx}_{hash(listing_url) % 10000}"
+                listing_id = f"cl_{self.city}_{self._listing_hash(listing_url, title, idx)}"
 
                 listings.append({
                     'id': listing_id,
                     'title': title,
+                    'title_lc': title.lower(),
                     'price': price,
                     'url': listing_url,
                     'marketplace': 'craigslist',
                     'category': self.category,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': now_iso
                 })
 
             except Exception as e:
                 logger.error(f"Error parsing Craigslist listing: {e}")
                 continue
 
-        logger.info(f"Scraped {len(listings)} Craigslist listings")
+        logger.info("Scraped %d Craigslist listings", len(listings))
         return listings
@@ -1,21 +1,45 @@
 """eBay marketplace scraper."""
-from typing import List, Dict
+from typing import Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
+import itertools
+import json
 import logging
+import re
+import aiohttp
+from selectolax.lexbor import LexborHTMLParser
 from .base_scraper import BaseScraper
 
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Both decoders accept bytes and raise ValueError subclasses on bad input
+_loads = orjson.loads if _ORJSON_AVAILABLE else json.loads
+
+# JSON-LD blocks embedded in search result pages
+_JSON_LD_RE = re.compile(
+    rb'<script[^>]*type="application/ld\+json"[^>]*>(.*?)</script>', re.DOTALL
+)
+
 
 class EbayScraper(BaseScraper):
     """Scraper for eBay listings."""
 
-    def __init__(self, category: str = "electronics"):
-        super().__init__(category)
+    def __init__(self, category: str = "electronics",
+                 session: Optional[aiohttp.ClientSession] = None):
+        super().__init__(category, session)
         self.base_url = "https://www.ebay.com"
 
-    def scrape_listings(self, max_results: int = 50) -> List[Dict]:
-        """Scrape eBay listings."""
+    async def scrape_listings(self, max_results: int = 50) -> List[Dict]:
+        """Scrape eBay listings.
+
+        Uses the page's JSON-LD structured data when present and falls
+        back to walking the result markup otherwise.
+        """
         listings = []
 
         # Category mapping (simplified category IDs)
@@ -28,51 +52,101 @@ class EbayScraper(BaseScraper):
         category_id = category_map.get(self.category, "293")
         url = f"{self.base_url}/sch/i.html?_nkw=&_sacat={category_id}&_sop=10"
 
-        logger.info(f"Scraping eBay: {url}")
+        logger.info("Scraping eBay: %s", url)
 
-        soup = self._make_request(url)
-        if not soup:
+        content = await self._fetch(url)
+        if not content:
             logger.warning("Failed to fetch eBay listings")
             return []
 
-        # Find all listing items
-        items = soup.find_all('div', class_='s-item__info', limit=max_results)
+        # One timestamp for the whole batch
+        now_iso = datetime.now().isoformat()
+
+        items = list(self._iter_structured_items(content))
+        if not items:
+            items = self._iter_html_items(LexborHTMLParser(content))
+
+        for idx, (title, price, listing_url) in enumerate(itertools.islice(items, max_results)):
+            # Skip sponsored items
+            if "Shop on eBay" in title or title == "Unknown":
+                continue
+
+            listing_id = f"ebay_{self._listing_hash(listing_url, title, idx)}"
+
+            listings.append({
+                'id': listing_id,
+                'title': title,
+                'title_lc': title.lower(),
+                'price': price,
+                'url': listing_url,
+                'marketplace': 'ebay',
+                'category': self.category,
+                'timestamp': now_iso
+            })
 
-        for idx, item in enumerate(items):
+        logger.info("Scraped %d eBay listings", len(listings))
+        return listings
+
+    def _iter_structured_items(self, content: bytes) -> Iterator[Tuple[str, float, str]]:
+        """Yield (title, price, url) for each product in the JSON-LD blocks."""
+        for blob in _JSON_LD_RE.findall(content):
             try:
-                # Extract title
-                title_elem = item.find('div', class_='s-item__title')
-                title = title_elem.get_text(strip=True) if title_elem else "Unknown"
+                data = _loads(blob)
+            except ValueError:
+                continue
 
-                # Skip sponsored items
-                if "Shop on eBay" in title or title == "Unknown":
-                    continue
+            for product in self._iter_products(data):
+                try:
+                    title = (product.get('name') or "Unknown").strip()
+                    price = self._extract_price(str(self._offer_price(product) or ""))
+                    yield title, price, product.get('url') or ""
+                except Exception as e:
+                    logger.error(f"Error parsing eBay structured listing: {e}")
+
+    def _iter_products(self, data) -> Iterator[Dict]:
+        """Yield Product objects from a JSON-LD document."""
+        if isinstance(data, list):
+            for entry in data:
+                yield from self._iter_products(entry)
+        elif isinstance(data, dict):
+            kind = data.get('@type')
+            if kind == 'Product':
+                yield data
+            elif kind == 'ItemList':
+                for element in data.get('itemListElement') or []:
+                    if isinstance(element, dict):
+                        yield from self._iter_products(element.get('item', element))
+            elif '@graph' in data:
+                yield from self._iter_products(data['@graph'])
+
+    def _offer_price(self, product: Dict) -> Optional[str]:
+        """Return the price of a Product's first offer."""
+        offers = product.get('offers')
+        if isinstance(offers, list):
+            offers = offers[0] if offers else None
+        if not isinstance(offers, dict):
+            return None
+        return offers.get('price', offers.get('lowPrice'))
+
+    def _iter_html_items(self, tree: LexborHTMLParser) -> Iterator[Tuple[str, float, str]]:
+        """Yield (title, price, url) for each result in the page markup."""
+        for item in tree.css('div.s-item__info'):
+            try:
+                # Extract title
+                title_elem = item.css_first('div.s-item__title')
+                title = title_elem.text(strip=True) if title_elem else "Unknown"
 
                 # Extract price
-                price_elem = item.find('span', class_='s-item__price')
-                price_str = price_elem.get_text(strip=True) if price_elem else "$0"
+                price_elem = item.css_first('span.s-item__price')
+                price_str = price_elem.text(strip=True) if price_elem else "$0"
                 price = self._extract_price(price_str)
 
                 # Extract URL
-                link_elem = item.find('a', class_='s-item__link')
-                listing_url = link_elem['href'] if link_elem and 'href' in link_elem.attrs else ""
-
-                # Generate ID from URL or index
-                listing_id = f"ebay_{idx}_{hash(listing_url) % 10000}"
-
-                listings.append({
-                    'id': listing_id,
-                    'title': title,
-                    'price': price,
-                    'url': listing_url,
-                    'marketplace': 'ebay',
-                    'category': self.category,
-                    'timestamp': datetime.now().isoformat()
-                })
+                link_elem = item.css_first('a.s-item__link')
+                listing_url = (link_elem.attributes.get('href') or "") if link_elem else ""
+
+                yield title, price, listing_url
 
             except Exception as e:
                 logger.error(f"Error parsing eBay listing: {e}")
                 continue
-
-        logger.info(f"Scraped {len(listings)} eBay listings")
-        return listings
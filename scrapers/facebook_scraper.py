@@ -1,12 +1,70 @@
 """Facebook Marketplace scraper (mock implementation)."""
-from typing import List, Dict
+from typing import List, Dict, Optional
 from datetime import datetime
 import logging
-import random
+import aiohttp
+import numpy as np
 from .base_scraper import BaseScraper
 
 logger = logging.getLogger(__name__)
 
+# Sample product names for realistic mock data
+_PRODUCTS = (
+    "iPhone 12 Pro Max 128GB",
+    "Sony PS5 Console",
+    "MacBook Air M1",
+    "Samsung 55\" 4K TV",
+    "iPad Pro 11 inch",
+    "Dell XPS 13 Laptop",
+    "Canon EOS Camera",
+    "Nintendo Switch OLED",
+    "AirPods Pro 2nd Gen",
+    "Samsung Galaxy S23",
+    "HP Gaming Laptop",
+    "Bose QuietComfort Headphones",
+    "Apple Watch Series 8",
+    "Fitbit Charge 5",
+    "Ring Video Doorbell"
+)
+
+# Price range by keyword; the first keyword found in a product name wins
+_BASE_PRICES = {
+    "iPhone": (400, 900),
+    "MacBook": (600, 1200),
+    "PS5": (350, 550),
+    "TV": (200, 600),
+    "iPad": (300, 800),
+    "Dell": (400, 900),
+    "Canon": (300, 700),
+    "Switch": (200, 350),
+    "AirPods": (100, 200),
+    "Galaxy": (400, 800),
+    "HP": (500, 1000),
+    "Bose": (150, 300),
+    "Watch": (250, 450),
+    "Fitbit": (80, 150),
+    "Ring": (80, 150)
+}
+
+_DEFAULT_PRICE_RANGE = (100, 500)
+
+# Keyword scan resolved once per product instead of once per listing
+_PRICE_BY_PRODUCT = {
+    name: next((val for key, val in _BASE_PRICES.items() if key in name),
+               _DEFAULT_PRICE_RANGE)
+    for name in _PRODUCTS
+}
+
+# Price bounds aligned with _PRODUCTS, for gathering by product index
+_PRICE_LOWS = np.array([_PRICE_BY_PRODUCT[name][0] for name in _PRODUCTS], dtype=np.float64)
+_PRICE_HIGHS = np.array([_PRICE_BY_PRODUCT[name][1] for name in _PRODUCTS], dtype=np.float64)
+
+# Listing titles depend only on the product, so build them once
+_TITLES = tuple(f"{name} - Great Condition" for name in _PRODUCTS)
+_TITLES_LC = tuple(title.lower() for title in _TITLES)
+
+_rng = np.random.default_rng()
+
 
 class FacebookScraper(BaseScraper):
     """Scraper for Facebook Marketplace listings.
@@ -16,74 +74,44 @@ class FacebookScraper(BaseScraper):
     In production, you would need Facebook's official API or Selenium with login.
     """
 
-    def __init__(self, location: str = "san-francisco", category: str = "electronics"):
-        super().__init__(category)
+    def __init__(self, location: str = "san-francisco", category: str = "electronics",
+                 session: Optional[aiohttp.ClientSession] = None):
+        super().__init__(category, session)
         self.location = location
 
-    def scrape_listings(self, max_results: int = 50) -> List[Dict]:
+    async def scrape_listings(self, max_results: int = 50) -> List[Dict]:
         """Generate mock Facebook Marketplace listings."""
         logger.info("Facebook Marketplace scraping (MOCK MODE - generating sample data)")
 
-        # Sample product names for realistic mock data
-        products = [
-            "iPhone 12 Pro Max 128GB",
-            "Sony PS5 Console",
-            "MacBook Air M1",
-            "Samsung 55\" 4K TV",
-            "iPad Pro 11 inch",
-            "Dell XPS 13 Laptop",
-            "Canon EOS Camera",
-            "Nintendo Switch OLED",
-            "AirPods Pro 2nd Gen",
-            "Samsung Galaxy S23",
-            "HP Gaming Laptop",
-            "Bose QuietComfort Headphones",
-            "Apple Watch Series 8",
-            "Fitbit Charge 5",
-            "Ring Video Doorbell"
-        ]
+        n = max(0, min(max_results, 30))
 
-        listings = []
+        # Draw every random field for the batch in one vectorized call each
+        picks = _rng.integers(0, len(_PRODUCTS), size=n)
+        prices = np.round(_rng.uniform(_PRICE_LOWS[picks], _PRICE_HIGHS[picks]), 2)
+        suffixes = _rng.integers(1000, 10000, size=n)
+        item_ids = _rng.integers(100000000, 1000000000, size=n)
+
+        # One timestamp for the whole batch
+        now_iso = datetime.now().isoformat()
 
-        for i in range(min(max_results, 30)):
-            product_name = random.choice(products)
-
-            # Generate realistic price variations
-            base_prices = {
-                "iPhone": (400, 900),
-                "MacBook": (600, 1200),
-                "PS5": (350, 550),
-                "TV": (200, 600),
-                "iPad": (300, 800),
-                "Dell": (400, 900),
-                "Canon": (300, 700),
-                "Switch": (200, 350),
-                "AirPods": (100, 200),
-                "Galaxy": (400, 800),
-                "HP": (500, 1000),
-                "Bose": (150, 300),
-                "Watch": (250, 450),
-                "Fitbit": (80, 150),
-                "Ring": (80, 150)
-            }
-
-            price_range = (100, 500)  # default
-            for key, val in base_prices.items():
-                if key in product_name:
-                    price_range = val
-                    break
-
-            price = random.uniform(price_range[0], price_range[1])
+        id_prefix = f"fb_{self.location}_"
+        category = self.category
+
+        listings = []
 
+        for i, pick, price, suffix, item_id in zip(
+                range(n), picks.tolist(), prices.tolist(),
+                suffixes.tolist(), item_ids.tolist()):
             listings.append({
-                'id': f"fb_{self.location}_{i}_{random.randint(1000, 9999)}",
-                'title': f"{product_name} - Great Condition",
-                'price': round(price, 2),
-                'url': f"https://facebook.com/marketplace/item/{random.randint(100000000, 999999999)}",
+                'id': f"{id_prefix}{i}_{suffix}",
+                'title': _TITLES[pick],
+                'title_lc': _TITLES_LC[pick],
+                'price': price,
+                'url': f"https://facebook.com/marketplace/item/{item_id}",
                 'marketplace': 'facebook',
-                'category': self.category,
-                'timestamp': datetime.now().isoformat()
+                'category': category,
+                'timestamp': now_iso
             })
 
-        logger.info(f"Generated {len(listings)} mock Facebook Marketplace listings")
+        logger.info("Generated %d mock Facebook Marketplace listings", len(listings))
         return listings
@@ -1,4 +1,8 @@
 """Storage package for SmartBuckets integration."""
 from .smartbuckets import SmartBucketsClient
+from .async_smartbuckets import AsyncSmartBucketsClient
+from .sqlite_store import SQLiteSmartBucketsClient
+from .submitter import StorageSubmitter
 
-__all__ = ['SmartBucketsClient']
+__all__ = ['SmartBucketsClient', 'AsyncSmartBucketsClient', 'SQLiteSmartBucketsClient',
+           'StorageSubmitter']
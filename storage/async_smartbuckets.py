@@ -0,0 +1,281 @@
+"""Async SmartBuckets client for callers running inside an event loop."""
+import asyncio
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+import aiohttp
+
+try:
+    import aiofiles
+    import aiofiles.os
+    _AIOFILES_AVAILABLE = True
+except ImportError:
+    _AIOFILES_AVAILABLE = False
+
+from .smartbuckets import _compile_where, _dumps, _loads
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of item files open at once during query_items
+MAX_OPEN_FILES = 64
+
+
+def _scan_item_ids(bucket_dir: str) -> List[str]:
+    """Return the IDs of the regular .json files in a bucket directory."""
+    with os.scandir(bucket_dir) as it:
+        return [
+            e.name[:-5] for e in it
+            if e.name.endswith('.json') and e.is_file(follow_symlinks=False)
+        ]
+
+
+class AsyncSmartBucketsClient:
+    """Async twin of SmartBucketsClient.
+
+    File I/O goes through aiofiles and API calls through a pooled aiohttp
+    session, so many bucket operations can overlap from one coroutine
+    without blocking the event loop.
+    """
+
+    def __init__(self, api_key: str = None, debug: bool = False):
+        if not _AIOFILES_AVAILABLE:
+            raise ImportError("aiofiles is required for AsyncSmartBucketsClient")
+
+        self.api_key = api_key or os.getenv('RAINDROP_API_KEY')
+        self.debug = debug  # Pretty-print stored items for human inspection
+        self.base_url = "https://raindrop-mcp.01k507j1ctjqm9r2t725jq93x1.lmapp.run"
+
+        if not self.api_key:
+            raise ValueError("RAINDROP_API_KEY not found in environment")
+
+        self.headers = {
+            'Authorization': f'Bearer {self.api_key}',
+            'Content-Type': 'application/json'
+        }
+
+        # Created lazily, since aiohttp sessions must be opened inside a running loop
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the open API session, creating it on first use."""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=64, keepalive_timeout=60)
+            self.session = aiohttp.ClientSession(connector=connector, headers=self.headers)
+        return self.session
+
+    async def aclose(self):
+        """Close the API session."""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    async def create_bucket(self, bucket_name: str) -> Dict:
+        """Create a new SmartBucket.
+
+        Args:
+            bucket_name: Name of the bucket to create
+
+        Returns:
+            Response from the API
+        """
+        try:
+            # Note: Replace with actual SmartBuckets API endpoint via _get_session()
+            logger.info("Creating bucket: %s", bucket_name)
+
+            # For demo purposes, we'll use local file storage as fallback
+            await aiofiles.os.makedirs(f".buckets/{bucket_name}", exist_ok=True)
+
+            return {
+                'success': True,
+                'bucket': bucket_name,
+                'message': f'Bucket {bucket_name} created (local fallback)'
+            }
+
+        except Exception as e:
+            logger.error(f"Error creating bucket: {e}")
+            return {'success': False, 'error': str(e)}
+
+    async def store_item(self, bucket_name: str, item_id: str, data: Dict) -> Dict:
+        """Store an item in a SmartBucket.
+
+        Args:
+            bucket_name: Bucket to store in
+            item_id: Unique identifier for the item
+            data: Data to store
+
+        Returns:
+            Response from the API
+        """
+        try:
+            logger.info("Storing item %s in bucket %s", item_id, bucket_name)
+
+            # Local file storage fallback
+            await aiofiles.os.makedirs(f".buckets/{bucket_name}", exist_ok=True)
+            await self._write_item(bucket_name, item_id, data)
+
+            return {
+                'success': True,
+                'bucket': bucket_name,
+                'item_id': item_id
+            }
+
+        except Exception as e:
+            logger.error(f"Error storing item: {e}")
+            return {'success': False, 'error': str(e)}
+
+    async def store_items_batch(self, bucket_name: str,
+                                items: List[Tuple[str, Dict]]) -> Dict:
+        """Store several items in a SmartBucket concurrently.
+
+        Args:
+            bucket_name: Bucket to store in
+            items: List of (item_id, data) pairs to store
+
+        Returns:
+            Response from the API
+        """
+        try:
+            logger.info("Storing %d items in bucket %s", len(items), bucket_name)
+
+            # Local file storage fallback
+            await aiofiles.os.makedirs(f".buckets/{bucket_name}", exist_ok=True)
+
+            limit = asyncio.Semaphore(MAX_OPEN_FILES)
+
+            async def write(item_id: str, data: Dict):
+                async with limit:
+                    await self._write_item(bucket_name, item_id, data)
+
+            await asyncio.gather(*(write(item_id, data) for item_id, data in items))
+
+            return {
+                'success': True,
+                'bucket': bucket_name,
+                'count': len(items)
+            }
+
+        except Exception as e:
+            logger.error(f"Error storing items: {e}")
+            return {'success': False, 'error': str(e)}
+
+    async def _write_item(self, bucket_name: str, item_id: str, data: Dict):
+        """Serialize an item and write it to its file."""
+        async with aiofiles.open(f".buckets/{bucket_name}/{item_id}.json", 'wb') as f:
+            await f.write(_dumps(data, indent=self.debug))
+
+    async def retrieve_item(self, bucket_name: str, item_id: str) -> Optional[Dict]:
+        """Retrieve an item from a SmartBucket.
+
+        Args:
+            bucket_name: Bucket to retrieve from
+            item_id: Unique identifier for the item
+
+        Returns:
+            Item data or None if not found
+        """
+        try:
+            # Local file storage fallback
+            async with aiofiles.open(f".buckets/{bucket_name}/{item_id}.json", 'rb') as f:
+                return _loads(await f.read())
+
+        except FileNotFoundError:
+            return None
+
+        except Exception as e:
+            logger.error(f"Error retrieving item: {e}")
+            return None
+
+    async def list_items(self, bucket_name: str) -> List[str]:
+        """List all items in a bucket.
+
+        Args:
+            bucket_name: Bucket to list
+
+        Returns:
+            List of item IDs
+        """
+        try:
+            # The scan and its is_file checks run off the event loop together
+            return await asyncio.to_thread(_scan_item_ids, f".buckets/{bucket_name}")
+
+        except FileNotFoundError:
+            return []
+
+        except Exception as e:
+            logger.error(f"Error listing items: {e}")
+            return []
+
+    async def delete_item(self, bucket_name: str, item_id: str) -> Dict:
+        """Delete an item from a bucket.
+
+        Args:
+            bucket_name: Bucket containing the item
+            item_id: Unique identifier for the item
+
+        Returns:
+            Response indicating success or failure
+        """
+        try:
+            await aiofiles.os.remove(f".buckets/{bucket_name}/{item_id}.json")
+            return {'success': True, 'item_id': item_id}
+
+        except FileNotFoundError:
+            return {'success': False, 'error': 'Item not found'}
+
+        except Exception as e:
+            logger.error(f"Error deleting item: {e}")
+            return {'success': False, 'error': str(e)}
+
+    async def query_items(self, bucket_name: str, filter_fn=None,
+                          where: Optional[Dict] = None) -> List[Dict]:
+        """Query items from a bucket with optional filter.
+
+        Item files are read concurrently, up to MAX_OPEN_FILES at a time.
+
+        Args:
+            bucket_name: Bucket to query
+            filter_fn: Optional function to filter items
+            where: Optional field conditions, e.g.
+                {'category': 'electronics', 'price_lt': 500}
+
+        Returns:
+            List of matching items
+        """
+        needles, matches = _compile_where(where) if where else ([], None)
+
+        try:
+            limit = asyncio.Semaphore(MAX_OPEN_FILES)
+
+            async def read(item_id: str) -> Optional[Dict]:
+                async with limit:
+                    try:
+                        path = f".buckets/{bucket_name}/{item_id}.json"
+                        async with aiofiles.open(path, 'rb') as f:
+                            buf = await f.read()
+
+                        # Skip parsing files missing a required value
+                        if not all(needle in buf for needle in needles):
+                            return None
+                        return _loads(buf)
+
+                    except FileNotFoundError:
+                        return None
+
+                    # One unreadable file must not fail the whole query
+                    except Exception as e:
+                        logger.error(f"Error retrieving item: {e}")
+                        return None
+
+            item_ids = await self.list_items(bucket_name)
+            loaded = await asyncio.gather(*(read(item_id) for item_id in item_ids))
+
+            return [
+                item for item in loaded
+                if item
+                and (matches is None or matches(item))
+                and (filter_fn is None or filter_fn(item))
+            ]
+
+        except Exception as e:
+            logger.error(f"Error querying items: {e}")
+            return []
@@ -1,18 +1,118 @@
 """SmartBuckets integration for persistent storage."""
 import os
 import json
+import atexit
 import logging
-from typing import Dict, List, Optional
+import operator
+import threading
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from typing import Callable, Dict, List, Optional, Set, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Buffered writes are flushed to disk once they exceed this many bytes
+WRITE_BUFFER_BYTES = 1 << 20
+
+# Number of raw items kept in memory for repeated retrieve_item calls
+ITEM_CACHE_SIZE = 4096
+
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+
+# Comparison suffixes accepted on query_items `where` keys, e.g. 'price_lt'
+_WHERE_OPS = {
+    '_lt': operator.lt,
+    '_lte': operator.le,
+    '_gt': operator.gt,
+    '_gte': operator.ge
+}
+
+if _ORJSON_AVAILABLE:
+    # numpy values and naive datetimes in item data serialize without conversion
+    _DUMPS_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+
+    def _dumps(data: Dict, indent: bool = False) -> bytes:
+        """Serialize item data to JSON bytes."""
+        option = _DUMPS_OPTIONS | orjson.OPT_INDENT_2 if indent else _DUMPS_OPTIONS
+        return orjson.dumps(data, option=option)
+
+    _loads = orjson.loads
+else:
+    def _dumps(data: Dict, indent: bool = False) -> bytes:
+        """Serialize item data to JSON bytes."""
+        if indent:
+            return json.dumps(data, indent=2, ensure_ascii=False).encode()
+        # Raw UTF-8 is shorter than \uXXXX escapes and matches orjson's output
+        return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode()
+
+    _loads = json.loads
+
+
+def _compile_where(where: Dict) -> Tuple[List[bytes], Callable[[Dict], bool]]:
+    """Compile a query_items `where` clause.
+
+    Keys match fields by equality, or by comparison when suffixed with
+    one of _WHERE_OPS (e.g. {'category': 'electronics', 'price_lt': 500}).
+
+    Args:
+        where: Mapping of field conditions that must all hold
+
+    Returns:
+        Byte strings every matching raw item must contain, and a
+        predicate that checks the conditions on a parsed item
+    """
+    needles = []
+    conditions = []
+
+    for key, value in where.items():
+        op = operator.eq
+        for suffix, suffix_op in _WHERE_OPS.items():
+            if key.endswith(suffix):
+                key, op = key[:-len(suffix)], suffix_op
+                break
+
+        conditions.append((key, op, value))
+
+        # A plain ASCII string serializes the same way in every encoder,
+        # so its quoted form must appear verbatim in a matching file
+        if (op is operator.eq and isinstance(value, str) and value.isascii()
+                and value.isprintable() and '"' not in value and '\\' not in value):
+            needles.append(f'"{value}"'.encode())
+
+    def matches(item: Dict) -> bool:
+        for key, op, value in conditions:
+            field = item.get(key)
+            try:
+                if field is None or not op(field, value):
+                    return False
+            except TypeError:
+                return False
+        return True
+
+    return needles, matches
+
 
 class SmartBucketsClient:
     """Client for LiquidMetal SmartBuckets storage."""
 
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, debug: bool = False, durable: bool = False,
+                 query_workers: int = 0):
         self.api_key = api_key or os.getenv('RAINDROP_API_KEY')
+        self.debug = debug  # Pretty-print stored items for human inspection
+        self.durable = durable  # fsync each item file before it is closed
+        # Threads overlapping query_items reads; only pays off on high-latency
+        # filesystems, since local reads are faster than the thread handoff
+        self.query_workers = query_workers
         self.base_url = "https://raindrop-mcp.01k507j1ctjqm9r2t725jq93x1.lmapp.run"
 
         if not self.api_key:
@@ -24,6 +124,36 @@ class SmartBucketsClient:
             'Content-Type': 'application/json'
         })
 
+        # Pooled keep-alive connections so API calls skip repeated handshakes
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=64,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=(429, 502, 503, 504)
+            )
+        )
+        self.session.mount('https://', adapter)
+
+        # Bucket directories known to exist, to skip repeated makedirs
+        self._ensured_dirs: Set[str] = set()
+
+        # Write-behind buffer of serialized items, keyed by bucket
+        self._pending: Dict[str, List[Tuple[str, bytes]]] = defaultdict(list)
+        self._pending_bytes = 0
+        self._lock = threading.Lock()
+
+        # LRU of raw item bytes keyed by (bucket, item_id), guarded by _lock.
+        # The epoch counts invalidations so a read racing a write isn't cached
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_epoch = 0
+
+        # Reused by every threaded query_items call; created on first use
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+        atexit.register(self.flush)
+
     def create_bucket(self, bucket_name: str) -> Dict:
         """Create a new SmartBucket.
 
@@ -36,11 +166,10 @@ class SmartBucketsClient:
         try:
             # Note: Replace with actual SmartBuckets API endpoint
             # This is a placeholder implementation
-            logger.info(f"Creating bucket: {bucket_name}")
+            logger.info("Creating bucket: %s", bucket_name)
 
             # For demo purposes, we'll use local file storage as fallback
-            bucket_dir = f".buckets/{bucket_name}"
-            os.makedirs(bucket_dir, exist_ok=True)
+            self._ensure_dir(f".buckets/{bucket_name}")
 
             return {
                 'success': True,
@@ -55,6 +184,10 @@ class SmartBucketsClient:
     def store_item(self, bucket_name: str, item_id: str, data: Dict) -> Dict:
         """Store an item in a SmartBucket.
 
+        Writes are buffered and reach disk on the next flush, which
+        happens when the buffer fills, before any read of the bucket,
+        or at exit.
+
         Args:
             bucket_name: Bucket to store in
             item_id: Unique identifier for the item
@@ -64,15 +197,10 @@ class SmartBucketsClient:
             Response from the API
         """
         try:
-            logger.info(f"Storing item {item_id} in bucket {bucket_name}")
+            logger.info("Storing item %s in bucket %s", item_id, bucket_name)
 
             # Local file storage fallback
-            bucket_dir = f".buckets/{bucket_name}"
-            os.makedirs(bucket_dir, exist_ok=True)
-
-            file_path = f"{bucket_dir}/{item_id}.json"
-            with open(file_path, 'w') as f:
-                json.dump(data, f, indent=2)
+            self._buffer_item(bucket_name, item_id, data)
 
             return {
                 'success': True,
@@ -84,6 +212,119 @@ class SmartBucketsClient:
             logger.error(f"Error storing item: {e}")
             return {'success': False, 'error': str(e)}
 
+    def store_items_batch(self, bucket_name: str,
+                          items: List[Tuple[str, Dict]]) -> Dict:
+        """Store several items in a SmartBucket with a single request.
+
+        Args:
+            bucket_name: Bucket to store in
+            items: List of (item_id, data) pairs to store
+
+        Returns:
+            Response from the API
+        """
+        try:
+            # Note: Replace with actual SmartBuckets batch endpoint, which
+            # takes one POST with a JSON array of {'id': ..., 'data': ...}
+            logger.info("Storing %d items in bucket %s", len(items), bucket_name)
+
+            # Local file storage fallback
+            self._buffer_items(bucket_name, items)
+
+            return {
+                'success': True,
+                'bucket': bucket_name,
+                'count': len(items)
+            }
+
+        except Exception as e:
+            logger.error(f"Error storing items: {e}")
+            return {'success': False, 'error': str(e)}
+
+    def _buffer_item(self, bucket_name: str, item_id: str, data: Dict):
+        """Serialize one item into the write buffer, flushing it once full."""
+        buf = _dumps(data, indent=self.debug)
+
+        with self._lock:
+            self._pending[bucket_name].append((item_id, buf))
+            self._pending_bytes += len(buf)
+            full = self._pending_bytes > WRITE_BUFFER_BYTES
+
+        if full:
+            self.flush()
+
+    def _buffer_items(self, bucket_name: str, items: List[Tuple[str, Dict]]):
+        """Serialize items into the write buffer, flushing it once full."""
+        serialized = [
+            (item_id, _dumps(data, indent=self.debug))
+            for item_id, data in items
+        ]
+
+        with self._lock:
+            self._pending[bucket_name].extend(serialized)
+            self._pending_bytes += sum(len(buf) for _, buf in serialized)
+            full = self._pending_bytes > WRITE_BUFFER_BYTES
+
+        if full:
+            self.flush()
+
+    def _ensure_dir(self, bucket_dir: str):
+        """Create a bucket directory unless it is already known to exist."""
+        if bucket_dir not in self._ensured_dirs:
+            os.makedirs(bucket_dir, exist_ok=True)
+            self._ensured_dirs.add(bucket_dir)
+
+    def flush(self, bucket_name: str = None):
+        """Write buffered items to disk.
+
+        Args:
+            bucket_name: Only flush this bucket; all buckets if None
+        """
+        with self._lock:
+            if bucket_name is None:
+                pending = dict(self._pending)
+                self._pending.clear()
+            elif bucket_name in self._pending:
+                pending = {bucket_name: self._pending.pop(bucket_name)}
+            else:
+                return
+
+            self._pending_bytes -= sum(
+                len(buf) for entries in pending.values() for _, buf in entries
+            )
+
+            # Written under the lock so reads never see a half-flushed bucket
+            for name, entries in pending.items():
+                bucket_dir = f".buckets/{name}"
+
+                # Each item is written on its own so one failure can't drop the rest
+                for item_id, buf in entries:
+                    self._invalidate_cached((name, item_id))
+                    file_path = f"{bucket_dir}/{item_id}.json"
+
+                    try:
+                        self._ensure_dir(bucket_dir)
+                        try:
+                            self._write_file(file_path, buf)
+                        except FileNotFoundError:
+                            # The directory may have been removed since it was cached
+                            self._ensured_dirs.discard(bucket_dir)
+                            self._ensure_dir(bucket_dir)
+                            self._write_file(file_path, buf)
+
+                    except Exception as e:
+                        logger.error(f"Error flushing item {item_id} to bucket {name}: {e}")
+
+    def _write_file(self, file_path: str, buf: bytes):
+        """Write serialized item bytes to a file with a single raw write."""
+        fd = os.open(file_path, _WRITE_FLAGS, 0o644)
+        try:
+            os.write(fd, buf)
+            if self.durable:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+
     def retrieve_item(self, bucket_name: str, item_id: str) -> Optional[Dict]:
         """Retrieve an item from a SmartBucket.
 
@@ -95,19 +336,60 @@ class SmartBucketsClient:
             Item data or None if not found
         """
         try:
+            self.flush(bucket_name)
+
             # Local file storage fallback
             file_path = f".buckets/{bucket_name}/{item_id}.json"
-
-            if not os.path.exists(file_path):
-                return None
-
-            with open(file_path, 'r') as f:
-                return json.load(f)
+            return self._retrieve_cached((bucket_name, item_id),
+                                         lambda: self._read_path(file_path))
 
         except Exception as e:
             logger.error(f"Error retrieving item: {e}")
             return None
 
+    def _retrieve_cached(self, key: Tuple[str, str],
+                         read_raw: Callable[[], Optional[bytes]]) -> Optional[Dict]:
+        """Return an item through the raw-bytes LRU.
+
+        Hits are parsed afresh, so callers always get their own object.
+        Only writes made through this client invalidate cached entries.
+
+        Args:
+            key: (bucket, item_id) of the item
+            read_raw: Reads the item's raw bytes on a miss, or returns None
+
+        Returns:
+            Item data or None if not found
+        """
+        with self._lock:
+            buf = self._cache.get(key)
+            if buf is not None:
+                self._cache.move_to_end(key)
+            epoch = self._cache_epoch
+
+        if buf is not None:
+            return _loads(buf)
+
+        buf = read_raw()
+        if buf is None:
+            return None
+
+        item = _loads(buf)
+
+        with self._lock:
+            # A write or delete during the read may have made buf stale
+            if epoch == self._cache_epoch:
+                self._cache[key] = buf
+                if len(self._cache) > ITEM_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+
+        return item
+
+    def _invalidate_cached(self, key: Tuple[str, str]):
+        """Drop an item from the LRU; the caller must hold _lock."""
+        self._cache.pop(key, None)
+        self._cache_epoch += 1
+
     def list_items(self, bucket_name: str) -> List[str]:
         """List all items in a bucket.
 
@@ -118,13 +400,16 @@ class SmartBucketsClient:
             List of item IDs
         """
         try:
-            bucket_dir = f".buckets/{bucket_name}"
+            self.flush(bucket_name)
 
-            if not os.path.exists(bucket_dir):
-                return []
+            with os.scandir(f".buckets/{bucket_name}") as it:
+                return [
+                    e.name[:-5] for e in it
+                    if e.name.endswith('.json') and e.is_file(follow_symlinks=False)
+                ]
 
-            files = os.listdir(bucket_dir)
-            return [f.replace('.json', '') for f in files if f.endswith('.json')]
+        except FileNotFoundError:
+            return []
 
         except Exception as e:
             logger.error(f"Error listing items: {e}")
@@ -141,40 +426,118 @@ class SmartBucketsClient:
             Response indicating success or failure
         """
         try:
+            self.flush(bucket_name)
+
             file_path = f".buckets/{bucket_name}/{item_id}.json"
 
-            if os.path.exists(file_path):
+            with self._lock:
+                self._invalidate_cached((bucket_name, item_id))
                 os.remove(file_path)
-                return {'success': True, 'item_id': item_id}
 
+            return {'success': True, 'item_id': item_id}
+
+        except FileNotFoundError:
             return {'success': False, 'error': 'Item not found'}
 
         except Exception as e:
             logger.error(f"Error deleting item: {e}")
             return {'success': False, 'error': str(e)}
 
-    def query_items(self, bucket_name: str, filter_fn=None) -> List[Dict]:
+    def query_items(self, bucket_name: str, filter_fn=None,
+                    where: Optional[Dict] = None) -> List[Dict]:
         """Query items from a bucket with optional filter.
 
+        Conditions in `where` are checked against each file's raw bytes
+        first, so items that can't match are skipped without parsing.
+
         Args:
             bucket_name: Bucket to query
             filter_fn: Optional function to filter items
+            where: Optional field conditions, e.g.
+                {'category': 'electronics', 'price_lt': 500}
 
         Returns:
             List of matching items
         """
-        try:
-            item_ids = self.list_items(bucket_name)
-            items = []
+        self.flush(bucket_name)
 
-            for item_id in item_ids:
-                item = self.retrieve_item(bucket_name, item_id)
-                if item:
-                    if filter_fn is None or filter_fn(item):
-                        items.append(item)
+        needles, matches = _compile_where(where) if where else ([], None)
 
-            return items
+        try:
+            with os.scandir(f".buckets/{bucket_name}") as it:
+                paths = [e.path for e in it if e.name.endswith('.json')]
+        except FileNotFoundError:
+            return []
+
+        try:
+            if self.query_workers > 0:
+                loaded = list(self._get_pool().map(self._load_path, paths, repeat(needles)))
+            else:
+                loaded = [self._load_path(path, needles) for path in paths]
+
+            return [
+                item for item in loaded
+                if item
+                and (matches is None or matches(item))
+                and (filter_fn is None or filter_fn(item))
+            ]
 
         except Exception as e:
             logger.error(f"Error querying items: {e}")
             return []
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """Return the query thread pool, creating it on first use."""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.query_workers,
+                                                thread_name_prefix='smartbuckets-query')
+            return self._pool
+
+    def close(self):
+        """Flush pending writes and release the query thread pool."""
+        self.flush()
+
+        with self._lock:
+            pool, self._pool = self._pool, None
+
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    def _load_path(self, path: str, needles: List[bytes] = ()) -> Optional[Dict]:
+        """Read and parse an item file.
+
+        Args:
+            path: Path of the item file
+            needles: Byte strings the raw file must contain to be parsed
+
+        Returns:
+            Item data, or None if the file is missing or lacks a needle
+        """
+        try:
+            buf = self._read_path(path)
+            if buf is None:
+                return None
+
+            for needle in needles:
+                if needle not in buf:
+                    return None
+
+            return _loads(buf)
+
+        except Exception as e:
+            logger.error(f"Error retrieving item: {e}")
+            return None
+
+    def _read_path(self, path: str) -> Optional[bytes]:
+        """Read an item file's raw bytes, or None if it doesn't exist."""
+        try:
+            # Unbuffered single read of the file's size
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            return None
+
+        try:
+            return os.read(fd, os.fstat(fd).st_size)
+        finally:
+            os.close(fd)
@@ -0,0 +1,256 @@
+"""SmartBuckets client backed by a single SQLite database."""
+import logging
+import os
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+
+from .smartbuckets import SmartBucketsClient, _compile_where, _dumps, _loads
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = ".buckets/smartbuckets.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    bucket TEXT NOT NULL,
+    id TEXT NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (bucket, id)
+) WITHOUT ROWID
+"""
+
+
+class SQLiteSmartBucketsClient(SmartBucketsClient):
+    """SmartBuckets client that keeps the local fallback in SQLite.
+
+    All buckets share one WAL-mode database with a row per item, so
+    batch writes are a single transaction and queries are one indexed
+    scan instead of a file open per item.
+    """
+
+    def __init__(self, api_key: str = None, debug: bool = False, durable: bool = False,
+                 db_path: str = DEFAULT_DB_PATH):
+        super().__init__(api_key=api_key, debug=debug, durable=durable)
+
+        self._ensure_dir(os.path.dirname(db_path) or ".")
+
+        # Shared with the storage submitter's worker threads, guarded by _lock
+        self._db = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # NORMAL can lose the last commits on power loss; FULL syncs every commit
+        self._db.execute(f"PRAGMA synchronous={'FULL' if durable else 'NORMAL'}")
+        self._db.execute(_SCHEMA)
+
+    def create_bucket(self, bucket_name: str) -> Dict:
+        """Create a new SmartBucket.
+
+        Buckets are implicit in the items table, so nothing is created locally.
+
+        Args:
+            bucket_name: Name of the bucket to create
+
+        Returns:
+            Response from the API
+        """
+        logger.info("Creating bucket: %s", bucket_name)
+
+        return {
+            'success': True,
+            'bucket': bucket_name,
+            'message': f'Bucket {bucket_name} created (local fallback)'
+        }
+
+    def store_item(self, bucket_name: str, item_id: str, data: Dict) -> Dict:
+        """Store an item in a SmartBucket.
+
+        Args:
+            bucket_name: Bucket to store in
+            item_id: Unique identifier for the item
+            data: Data to store
+
+        Returns:
+            Response from the API
+        """
+        try:
+            logger.info("Storing item %s in bucket %s", item_id, bucket_name)
+
+            self._write_rows(bucket_name, [(item_id, data)])
+
+            return {
+                'success': True,
+                'bucket': bucket_name,
+                'item_id': item_id
+            }
+
+        except Exception as e:
+            logger.error(f"Error storing item: {e}")
+            return {'success': False, 'error': str(e)}
+
+    def store_items_batch(self, bucket_name: str,
+                          items: List[Tuple[str, Dict]]) -> Dict:
+        """Store several items in a SmartBucket in one transaction.
+
+        Args:
+            bucket_name: Bucket to store in
+            items: List of (item_id, data) pairs to store
+
+        Returns:
+            Response from the API
+        """
+        try:
+            logger.info("Storing %d items in bucket %s", len(items), bucket_name)
+
+            self._write_rows(bucket_name, items)
+
+            return {
+                'success': True,
+                'bucket': bucket_name,
+                'count': len(items)
+            }
+
+        except Exception as e:
+            logger.error(f"Error storing items: {e}")
+            return {'success': False, 'error': str(e)}
+
+    def _write_rows(self, bucket_name: str, items: List[Tuple[str, Dict]]):
+        """Upsert items into the bucket within a single transaction."""
+        rows = [
+            (bucket_name, item_id, _dumps(data, indent=self.debug))
+            for item_id, data in items
+        ]
+
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO items (bucket, id, data) VALUES (?, ?, ?)", rows
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+            for item_id, _ in items:
+                self._invalidate_cached((bucket_name, item_id))
+
+    def flush(self, bucket_name: str = None):
+        """Writes are committed as they are made, so there is nothing to flush."""
+
+    def retrieve_item(self, bucket_name: str, item_id: str) -> Optional[Dict]:
+        """Retrieve an item from a SmartBucket.
+
+        Args:
+            bucket_name: Bucket to retrieve from
+            item_id: Unique identifier for the item
+
+        Returns:
+            Item data or None if not found
+        """
+        try:
+            key = (bucket_name, item_id)
+            return self._retrieve_cached(key, lambda: self._select_raw(key))
+
+        except Exception as e:
+            logger.error(f"Error retrieving item: {e}")
+            return None
+
+    def _select_raw(self, key: Tuple[str, str]) -> Optional[bytes]:
+        """Read an item's raw bytes, or None if it doesn't exist."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM items WHERE bucket = ? AND id = ?", key
+            ).fetchone()
+
+        return row[0] if row is not None else None
+
+    def list_items(self, bucket_name: str) -> List[str]:
+        """List all items in a bucket.
+
+        Args:
+            bucket_name: Bucket to list
+
+        Returns:
+            List of item IDs
+        """
+        try:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT id FROM items WHERE bucket = ?", (bucket_name,)
+                ).fetchall()
+
+            return [item_id for item_id, in rows]
+
+        except Exception as e:
+            logger.error(f"Error listing items: {e}")
+            return []
+
+    def delete_item(self, bucket_name: str, item_id: str) -> Dict:
+        """Delete an item from a bucket.
+
+        Args:
+            bucket_name: Bucket containing the item
+            item_id: Unique identifier for the item
+
+        Returns:
+            Response indicating success or failure
+        """
+        try:
+            with self._lock:
+                self._invalidate_cached((bucket_name, item_id))
+
+                deleted = self._db.execute(
+                    "DELETE FROM items WHERE bucket = ? AND id = ?", (bucket_name, item_id)
+                ).rowcount
+
+            if deleted:
+                return {'success': True, 'item_id': item_id}
+
+            return {'success': False, 'error': 'Item not found'}
+
+        except Exception as e:
+            logger.error(f"Error deleting item: {e}")
+            return {'success': False, 'error': str(e)}
+
+    def query_items(self, bucket_name: str, filter_fn=None,
+                    where: Optional[Dict] = None) -> List[Dict]:
+        """Query items from a bucket with optional filter.
+
+        Args:
+            bucket_name: Bucket to query
+            filter_fn: Optional function to filter items
+            where: Optional field conditions, e.g.
+                {'category': 'electronics', 'price_lt': 500}
+
+        Returns:
+            List of matching items
+        """
+        needles, matches = _compile_where(where) if where else ([], None)
+
+        try:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT data FROM items WHERE bucket = ?", (bucket_name,)
+                ).fetchall()
+
+            # Rows missing a required value are skipped before parsing
+            loaded = (
+                _loads(data) for data, in rows
+                if all(needle in data for needle in needles)
+            )
+
+            return [
+                item for item in loaded
+                if (matches is None or matches(item))
+                and (filter_fn is None or filter_fn(item))
+            ]
+
+        except Exception as e:
+            logger.error(f"Error querying items: {e}")
+            return []
+
+    def close(self):
+        """Close the database connection."""
+        super().close()
+
+        with self._lock:
+            self._db.close()
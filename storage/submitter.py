@@ -0,0 +1,93 @@
+"""Background submission queue for SmartBuckets writes."""
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from .smartbuckets import SmartBucketsClient
+
+logger = logging.getLogger(__name__)
+
+
+class StorageSubmitter:
+    """Queue storage writes and flush them in batches in the background.
+
+    Callers enqueue writes with put() and carry on; a worker task drains
+    the queue into store_items_batch calls so that storage I/O overlaps
+    with scraping and evaluation instead of blocking them.
+    """
+
+    def __init__(self, client: SmartBucketsClient, max_batch: int = 64,
+                 flush_interval: float = 0.05):
+        self.client = client
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def put(self, bucket_name: str, item_id: str, data: Dict):
+        """Queue an item to be stored in a SmartBucket.
+
+        Args:
+            bucket_name: Bucket to store in
+            item_id: Unique identifier for the item
+            data: Data to store
+        """
+        # The worker is started lazily since it needs a running event loop
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+        await self._queue.put((bucket_name, item_id, data))
+
+    async def drain(self):
+        """Wait until every queued write is stored, then stop the worker."""
+        if self._worker is None:
+            return
+
+        await self._queue.join()
+
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+
+        self._worker = None
+        self._queue = None
+
+    async def _run(self):
+        """Pull writes off the queue and flush them in batches."""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+
+            # Collect up to max_batch writes or until flush_interval elapses
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    await asyncio.sleep(remaining)
+
+            try:
+                await self._flush(batch)
+            except Exception as e:
+                logger.error(f"Error flushing storage batch: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush(self, batch: List[Tuple[str, str, Dict]]):
+        """Store a batch of writes with one store_items_batch call per bucket."""
+        by_bucket = defaultdict(list)
+        for bucket_name, item_id, data in batch:
+            by_bucket[bucket_name].append((item_id, data))
+
+        for bucket_name, items in by_bucket.items():
+            await asyncio.to_thread(self.client.store_items_batch, bucket_name, items)